@@ -4,8 +4,6 @@
 #include <vector>
 #include <openssl/evp.h>
 #include <openssl/sha.h>
-#include <sstream>
-#include <iomanip>
 
 namespace SentinelFS {
 
@@ -18,43 +16,35 @@ public:
      * @brief Hash a string to hex-encoded SHA256
      */
     static std::string hash(const std::string& input) {
-        return hashBytes(std::vector<uint8_t>(input.begin(), input.end()));
+        return hashRaw(input.data(), input.size());
     }
     
     /**
      * @brief Hash binary data to hex-encoded SHA256
      */
     static std::string hashBytes(const std::vector<uint8_t>& data) {
+        return hashRaw(data.data(), data.size());
+    }
+
+private:
+    static std::string hashRaw(const void* data, size_t length) {
         unsigned char hash[SHA256_DIGEST_LENGTH];
+        unsigned int hashLen = 0;
         
-        EVP_MD_CTX* ctx = EVP_MD_CTX_new();
-        if (!ctx) return "";
-        
-        if (EVP_DigestInit_ex(ctx, EVP_sha256(), nullptr) != 1) {
-            EVP_MD_CTX_free(ctx);
-            return "";
-        }
-        
-        if (EVP_DigestUpdate(ctx, data.data(), data.size()) != 1) {
-            EVP_MD_CTX_free(ctx);
+        // One call replaces the separate init/update/final steps
+        if (EVP_Digest(data, length, hash, &hashLen, EVP_sha256(), nullptr) != 1) {
             return "";
         }
         
-        unsigned int hashLen;
-        if (EVP_DigestFinal_ex(ctx, hash, &hashLen) != 1) {
-            EVP_MD_CTX_free(ctx);
-            return "";
-        }
-        
-        EVP_MD_CTX_free(ctx);
-        
         // Convert to hex string
-        std::stringstream ss;
+        static const char hexDigits[] = "0123456789abcdef";
+        std::string hex(hashLen * 2, '0');
         for (unsigned int i = 0; i < hashLen; ++i) {
-            ss << std::hex << std::setfill('0') << std::setw(2) << (int)hash[i];
+            hex[i * 2] = hexDigits[hash[i] >> 4];
+            hex[i * 2 + 1] = hexDigits[hash[i] & 0x0F];
         }
         
-        return ss.str();
+        return hex;
     }
 };
 
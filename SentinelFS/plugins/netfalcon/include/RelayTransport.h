@@ -14,6 +14,7 @@
 #include <thread>
 #include <atomic>
 #include <queue>
+#include <condition_variable>
 
 namespace SentinelFS {
 
@@ -36,6 +37,9 @@ enum class RelayMessageType : uint8_t {
     ERROR_MSG = 0xFF
 };
 
+/// Relay frame header: [type (1 byte)][payload length (4 bytes, big-endian)]
+constexpr size_t RELAY_HEADER_SIZE = 5;
+
 /**
  * @brief Relay peer info
  */
@@ -122,9 +126,15 @@ private:
     void heartbeatLoop();
     
     bool sendMessage(RelayMessageType type, const std::vector<uint8_t>& payload);
-    void handleMessage(RelayMessageType type, const std::vector<uint8_t>& payload);
-    void handlePeerList(const std::vector<uint8_t>& payload);
-    void handleData(const std::vector<uint8_t>& payload);
+    bool enqueueFrame(std::vector<uint8_t>&& frame);
+    bool sendFrames(int sock, std::vector<std::vector<uint8_t>>& frames);
+    void wakeWorkers();
+    void clearWriteQueue();
+    std::vector<uint8_t> acquireBuffer();
+    void recycleBuffer(std::vector<uint8_t>&& buffer);
+    void handleMessage(RelayMessageType type, const uint8_t* payload, size_t length);
+    void handlePeerList(const uint8_t* payload, size_t length);
+    void handleData(const uint8_t* payload, size_t length);
     
     void emitEvent(TransportEvent event, const std::string& peerId,
                    const std::string& message = "", const std::vector<uint8_t>& data = {});
@@ -136,7 +146,7 @@ private:
     // Server connection
     std::string serverHost_;
     int serverPort_{9000};
-    int serverSocket_{-1};
+    std::atomic<int> serverSocket_{-1};  // Read by sendMessage() from any thread
     std::atomic<bool> serverConnected_{false};
     std::atomic<bool> running_{false};
     
@@ -148,9 +158,21 @@ private:
     std::thread writeThread_;
     std::thread heartbeatThread_;
     
-    // Write queue
+    // Write queue (bounded, drained in batches by writeLoop)
     mutable std::mutex writeMutex_;
+    std::condition_variable writeCv_;
     std::queue<std::vector<uint8_t>> writeQueue_;
+    size_t writeQueueBytes_{0};
+    
+    // Recycled frame buffers; separate from writeMutex_ so producers taking a
+    // buffer don't contend with the writer draining the queue
+    std::mutex poolMutex_;
+    std::vector<std::vector<uint8_t>> bufferPool_;
+    size_t pooledBytes_{0};  // Total capacity held by bufferPool_
+    
+    // Heartbeat scheduling
+    std::mutex heartbeatMutex_;
+    std::condition_variable heartbeatCv_;
     
     // Peer tracking
     mutable std::mutex peerMutex_;
@@ -161,6 +183,16 @@ private:
     static constexpr int HEARTBEAT_INTERVAL_SEC = 30;
     static constexpr int RECONNECT_DELAY_SEC = 5;
     static constexpr int CONNECT_TIMEOUT_SEC = 10;
+    // DATA frames queued before dropping. Queued bytes exclude the batch the
+    // writer is sending, so up to ~2x MAX_WRITE_QUEUE_BYTES can be buffered.
+    static constexpr size_t MAX_WRITE_QUEUE = 1024;
+    static constexpr size_t MAX_WRITE_QUEUE_BYTES = 16 * 1024 * 1024;
+    static constexpr size_t MAX_FRAME_PAYLOAD = 10 * 1024 * 1024;  // Enforced in both directions
+    static constexpr size_t WRITE_BATCH_SIZE = 32;   // Messages coalesced per send
+    static constexpr size_t READ_CHUNK_SIZE = 64 * 1024;
+    static constexpr size_t MAX_READ_BUFFER_RETAINED = READ_CHUNK_SIZE * 4;  // Larger is freed when idle
+    static constexpr size_t MAX_POOLED_BYTES = 1024 * 1024;      // Idle capacity kept by the pool
+    static constexpr size_t MAX_POOLED_BUFFER_SIZE = 64 * 1024;  // Larger frames are freed
 };
 
 } // namespace NetFalcon
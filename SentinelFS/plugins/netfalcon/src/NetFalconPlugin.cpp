@@ -260,15 +260,15 @@ bool NetFalconPlugin::sendData(const std::string& peerId, const std::vector<uint
         return false;
     }
     
-    std::vector<uint8_t> dataToSend = data;
+    // Fast path: without encryption the caller's buffer is sent as-is
+    if (!sessionManager_.isEncryptionEnabled()) {
+        return transport->send(peerId, data);
+    }
     
-    // Encrypt if enabled
-    if (sessionManager_.isEncryptionEnabled()) {
-        dataToSend = sessionManager_.encrypt(data, peerId);
-        if (dataToSend.empty()) {
-            Logger::instance().log(LogLevel::ERROR, "Encryption failed", "NetFalcon");
-            return false;
-        }
+    std::vector<uint8_t> dataToSend = sessionManager_.encrypt(data, peerId);
+    if (dataToSend.empty()) {
+        Logger::instance().log(LogLevel::ERROR, "Encryption failed", "NetFalcon");
+        return false;
     }
     
     return transport->send(peerId, dataToSend);
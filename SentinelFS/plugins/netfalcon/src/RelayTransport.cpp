@@ -3,7 +3,9 @@
 #include "Logger.h"
 #include "MetricsCollector.h"
 #include <cstring>
+#include <cerrno>
 #include <sys/socket.h>
+#include <sys/uio.h>
 #include <netinet/in.h>
 #include <arpa/inet.h>
 #include <netdb.h>
@@ -16,6 +18,30 @@
 namespace SentinelFS {
 namespace NetFalcon {
 
+namespace {
+
+// Frame header: [type (1 byte)][length (4 bytes, big-endian)]
+void appendFrameHeader(std::vector<uint8_t>& frame, RelayMessageType type, size_t length) {
+    uint32_t len = static_cast<uint32_t>(length);
+    const uint8_t header[RELAY_HEADER_SIZE] = {
+        static_cast<uint8_t>(type),
+        static_cast<uint8_t>(len >> 24),
+        static_cast<uint8_t>(len >> 16),
+        static_cast<uint8_t>(len >> 8),
+        static_cast<uint8_t>(len)
+    };
+    frame.insert(frame.end(), header, header + RELAY_HEADER_SIZE);
+}
+
+uint32_t readFrameLength(const uint8_t* header) {
+    return (static_cast<uint32_t>(header[1]) << 24) |
+           (static_cast<uint32_t>(header[2]) << 16) |
+           (static_cast<uint32_t>(header[3]) << 8) |
+           static_cast<uint32_t>(header[4]);
+}
+
+} // namespace
+
 RelayTransport::RelayTransport(EventBus* eventBus, SessionManager* sessionManager)
     : eventBus_(eventBus)
     , sessionManager_(sessionManager)
@@ -59,13 +85,17 @@ bool RelayTransport::connect(const std::string& address, int port, const std::st
 }
 
 void RelayTransport::disconnect(const std::string& peerId) {
-    std::lock_guard<std::mutex> lock(peerMutex_);
-    peerStates_.erase(peerId);
-    peerQuality_.erase(peerId);
+    {
+        std::lock_guard<std::mutex> lock(peerMutex_);
+        peerStates_.erase(peerId);
+        peerQuality_.erase(peerId);
+    }
     
-    // Send disconnect notification
+    // Send disconnect notification outside peerMutex_ so callbacks can query us
     std::vector<uint8_t> payload(peerId.begin(), peerId.end());
-    sendMessage(RelayMessageType::DISCONNECT, payload);
+    if (!sendMessage(RelayMessageType::DISCONNECT, payload)) {
+        Logger::instance().log(LogLevel::WARN, "Failed to notify relay of disconnect: " + peerId, "RelayTransport");
+    }
     
     emitEvent(TransportEvent::DISCONNECTED, peerId);
 }
@@ -75,13 +105,23 @@ bool RelayTransport::send(const std::string& peerId, const std::vector<uint8_t>&
         return false;
     }
     
-    // Format: [peerId length (1 byte)][peerId][data]
-    std::vector<uint8_t> payload;
-    payload.push_back(static_cast<uint8_t>(peerId.size()));
-    payload.insert(payload.end(), peerId.begin(), peerId.end());
-    payload.insert(payload.end(), data.begin(), data.end());
+    // Payload format: [peerId length (1 byte)][peerId][data]
+    // Built directly into the frame so the data is copied only once
+    size_t payloadSize = 1 + peerId.size() + data.size();
+    if (payloadSize > MAX_FRAME_PAYLOAD) {
+        // Reject before allocating and copying the payload into a frame
+        Logger::instance().log(LogLevel::ERROR, "Message too large for relay: " + std::to_string(payloadSize) + " bytes", "RelayTransport");
+        return false;
+    }
+    
+    std::vector<uint8_t> frame = acquireBuffer();
+    frame.reserve(RELAY_HEADER_SIZE + payloadSize);
+    appendFrameHeader(frame, RelayMessageType::DATA, payloadSize);
+    frame.push_back(static_cast<uint8_t>(peerId.size()));
+    frame.insert(frame.end(), peerId.begin(), peerId.end());
+    frame.insert(frame.end(), data.begin(), data.end());
     
-    return sendMessage(RelayMessageType::DATA, payload);
+    return enqueueFrame(std::move(frame));
 }
 
 bool RelayTransport::isConnected(const std::string& peerId) const {
@@ -118,9 +158,8 @@ void RelayTransport::setEventCallback(TransportEventCallback callback) {
 }
 
 int RelayTransport::measureRTT(const std::string& peerId) {
-    // For relay, RTT includes relay server latency
-    // Send a ping through relay and measure response time
-    auto start = std::chrono::high_resolution_clock::now();
+    // For relay, RTT includes relay server latency.
+    // No probe is sent; report the cached quality or a fixed estimate.
     
     // Simple estimation based on server connection
     if (!serverConnected_) return -1;
@@ -144,7 +183,10 @@ void RelayTransport::shutdown() {
 bool RelayTransport::connectToServer(const std::string& host, int port, const std::string& sessionCode) {
     auto& logger = Logger::instance();
     
-    if (serverConnected_) {
+    // A connection dropped by a worker (connection lost, oversized frame, failed
+    // send) leaves serverConnected_ false but its threads still joinable
+    if (serverConnected_ || readThread_.joinable() || writeThread_.joinable() ||
+        heartbeatThread_.joinable()) {
         disconnectFromServer();
     }
     
@@ -190,6 +232,9 @@ bool RelayTransport::connectToServer(const std::string& host, int port, const st
     
     freeaddrinfo(res);
     
+    // REGISTER must be the first frame on the new stream
+    clearWriteQueue();
+    
     // Send registration
     std::ostringstream regData;
     regData << localPeerId_ << "|" << sessionCode_;
@@ -224,17 +269,30 @@ void RelayTransport::disconnectFromServer() {
     
     running_ = false;
     serverConnected_ = false;
+    wakeWorkers();
     
-    if (serverSocket_ >= 0) {
-        ::shutdown(serverSocket_, SHUT_RDWR);
-        close(serverSocket_);
-        serverSocket_ = -1;
+    // Shut down, join, then close: workers hold the fd until they exit, so it
+    // must not be closed (and possibly reused) while any of them can touch it
+    int sock = serverSocket_.exchange(-1);
+    if (sock >= 0) {
+        ::shutdown(sock, SHUT_RDWR);
     }
     
     if (readThread_.joinable()) readThread_.join();
     if (writeThread_.joinable()) writeThread_.join();
     if (heartbeatThread_.joinable()) heartbeatThread_.join();
     
+    if (sock >= 0) {
+        close(sock);
+    }
+    
+    clearWriteQueue();
+    {
+        std::lock_guard<std::mutex> lock(poolMutex_);
+        bufferPool_.clear();
+        pooledBytes_ = 0;
+    }
+    
     {
         std::lock_guard<std::mutex> lock(peerMutex_);
         relayPeers_.clear();
@@ -244,6 +302,12 @@ void RelayTransport::disconnectFromServer() {
     logger.log(LogLevel::INFO, "Disconnected from relay server", "RelayTransport");
 }
 
+void RelayTransport::clearWriteQueue() {
+    std::lock_guard<std::mutex> lock(writeMutex_);
+    std::queue<std::vector<uint8_t>>().swap(writeQueue_);
+    writeQueueBytes_ = 0;
+}
+
 std::string RelayTransport::getServerAddress() const {
     return serverHost_ + ":" + std::to_string(serverPort_);
 }
@@ -251,6 +315,7 @@ std::string RelayTransport::getServerAddress() const {
 std::vector<RelayPeerInfo> RelayTransport::getRelayPeers() const {
     std::lock_guard<std::mutex> lock(peerMutex_);
     std::vector<RelayPeerInfo> peers;
+    peers.reserve(relayPeers_.size());
     for (const auto& [_, peer] : relayPeers_) {
         peers.push_back(peer);
     }
@@ -264,66 +329,200 @@ void RelayTransport::requestPeerList() {
 void RelayTransport::readLoop() {
     auto& logger = Logger::instance();
     
+    // Frames are parsed out of a persistent buffer so that a single recv()
+    // can deliver several messages; pos marks the start of unparsed data.
+    const int sock = serverSocket_;
+    std::vector<uint8_t> buffer;
+    size_t pos = 0;
+    
     while (running_ && serverConnected_) {
-        // Read message header: [type (1 byte)][length (4 bytes)]
-        uint8_t header[5];
-        ssize_t n = recv(serverSocket_, header, 5, MSG_WAITALL);
+        // Receive straight into the tail of the buffer, then trim to what arrived
+        size_t oldSize = buffer.size();
+        buffer.resize(oldSize + READ_CHUNK_SIZE);
+        ssize_t n = recv(sock, buffer.data() + oldSize, READ_CHUNK_SIZE, 0);
+        buffer.resize(oldSize + (n > 0 ? static_cast<size_t>(n) : 0));
+        
+        if (n < 0 && (errno == EAGAIN || errno == EWOULDBLOCK || errno == EINTR)) {
+            continue; // Receive timeout - re-check running_ and keep waiting
+        }
         
         if (n <= 0) {
             if (running_) {
                 logger.log(LogLevel::WARN, "Relay server connection lost", "RelayTransport");
                 serverConnected_ = false;
+                wakeWorkers();
             }
             break;
         }
         
-        RelayMessageType type = static_cast<RelayMessageType>(header[0]);
-        uint32_t length = (header[1] << 24) | (header[2] << 16) | (header[3] << 8) | header[4];
-        
-        if (length > 10 * 1024 * 1024) { // 10MB limit
-            logger.log(LogLevel::ERROR, "Message too large from relay", "RelayTransport");
-            continue;
+        // Dispatch every complete frame: [type (1 byte)][length (4 bytes)][payload]
+        while (buffer.size() - pos >= RELAY_HEADER_SIZE) {
+            const uint8_t* header = buffer.data() + pos;
+            RelayMessageType type = static_cast<RelayMessageType>(header[0]);
+            uint32_t length = readFrameLength(header);
+            
+            if (length > MAX_FRAME_PAYLOAD) {
+                // The stream cannot be resynchronised past an unread payload
+                logger.log(LogLevel::ERROR, "Message too large from relay, dropping connection", "RelayTransport");
+                serverConnected_ = false;
+                wakeWorkers();
+                return;
+            }
+            
+            if (buffer.size() - pos < RELAY_HEADER_SIZE + static_cast<size_t>(length)) break;
+            
+            // Handlers read the payload in place; it stays valid until the next recv()
+            const uint8_t* payload = header + RELAY_HEADER_SIZE;
+            pos += RELAY_HEADER_SIZE + length;
+            
+            handleMessage(type, payload, length);
         }
         
-        std::vector<uint8_t> payload(length);
-        if (length > 0) {
-            n = recv(serverSocket_, payload.data(), length, MSG_WAITALL);
-            if (n <= 0) break;
+        // Compact once more than half of the buffer has been consumed
+        if (pos == buffer.size()) {
+            // Don't keep memory sized for a past large frame for the whole connection
+            if (buffer.capacity() > MAX_READ_BUFFER_RETAINED) {
+                std::vector<uint8_t>().swap(buffer);
+            } else {
+                buffer.clear();
+            }
+            pos = 0;
+        } else if (pos > buffer.size() / 2) {
+            buffer.erase(buffer.begin(), buffer.begin() + pos);
+            pos = 0;
         }
-        
-        handleMessage(type, payload);
     }
 }
 
 void RelayTransport::writeLoop() {
+    const int sock = serverSocket_;
+    std::vector<std::vector<uint8_t>> batch;
+    batch.reserve(WRITE_BATCH_SIZE);
+    
     while (running_ && serverConnected_) {
-        std::vector<uint8_t> message;
-        
         {
-            std::lock_guard<std::mutex> lock(writeMutex_);
-            if (!writeQueue_.empty()) {
-                message = std::move(writeQueue_.front());
+            std::unique_lock<std::mutex> lock(writeMutex_);
+            writeCv_.wait(lock, [this] {
+                return !writeQueue_.empty() || !running_ || !serverConnected_;
+            });
+            
+            // Take up to WRITE_BATCH_SIZE queued frames for one sendmsg()
+            while (batch.size() < WRITE_BATCH_SIZE && !writeQueue_.empty()) {
+                writeQueueBytes_ -= writeQueue_.front().size();
+                batch.push_back(std::move(writeQueue_.front()));
                 writeQueue_.pop();
             }
         }
         
-        if (!message.empty()) {
-            ssize_t sent = ::send(serverSocket_, message.data(), message.size(), 0);
-            if (sent < 0) {
-                Logger::instance().log(LogLevel::ERROR, "Failed to send to relay", "RelayTransport");
+        if (batch.empty()) continue;
+        
+        if (!sendFrames(sock, batch)) {
+            // A frame may have been partially written, so the stream is no
+            // longer aligned on a header; never write after this point.
+            // A failure caused by disconnectFromServer() is expected, not an error.
+            if (running_ && serverConnected_) {
+                Logger::instance().log(LogLevel::ERROR, "Failed to send to relay, dropping connection", "RelayTransport");
+                serverConnected_ = false;
+                ::shutdown(sock, SHUT_RDWR); // Unblock readLoop's recv()
+                wakeWorkers();
+            }
+        }
+        
+        {
+            std::lock_guard<std::mutex> lock(poolMutex_);
+            for (auto& frame : batch) {
+                recycleBuffer(std::move(frame));
             }
-        } else {
-            std::this_thread::sleep_for(std::chrono::milliseconds(10));
         }
+        batch.clear();
     }
 }
 
+std::vector<uint8_t> RelayTransport::acquireBuffer() {
+    std::lock_guard<std::mutex> lock(poolMutex_);
+    if (bufferPool_.empty()) {
+        return {};
+    }
+    std::vector<uint8_t> buffer = std::move(bufferPool_.back());
+    bufferPool_.pop_back();
+    pooledBytes_ -= buffer.capacity();
+    return buffer;
+}
+
+void RelayTransport::recycleBuffer(std::vector<uint8_t>&& buffer) {
+    // Caller holds poolMutex_
+    if (buffer.capacity() > MAX_POOLED_BUFFER_SIZE ||
+        pooledBytes_ + buffer.capacity() > MAX_POOLED_BYTES) {
+        return;
+    }
+    buffer.clear();
+    pooledBytes_ += buffer.capacity();
+    bufferPool_.push_back(std::move(buffer));
+}
+
+void RelayTransport::wakeWorkers() {
+    // Taking each lock ensures the loop is either waiting or will see the new state
+    {
+        std::lock_guard<std::mutex> lock(writeMutex_);
+    }
+    writeCv_.notify_all();
+    {
+        std::lock_guard<std::mutex> lock(heartbeatMutex_);
+    }
+    heartbeatCv_.notify_all();
+}
+
+bool RelayTransport::sendFrames(int sock, std::vector<std::vector<uint8_t>>& frames) {
+    // Scatter-gather the frames straight from their buffers, no concatenation
+    struct iovec iov[WRITE_BATCH_SIZE];
+    size_t count = 0;
+    for (auto& frame : frames) {
+        iov[count].iov_base = frame.data();
+        iov[count].iov_len = frame.size();
+        ++count;
+    }
+    
+    size_t first = 0;
+    while (first < count) {
+        struct msghdr msg{};
+        msg.msg_iov = iov + first;
+        msg.msg_iovlen = count - first;
+        
+        ssize_t sent = sendmsg(sock, &msg, MSG_NOSIGNAL);
+        if (sent < 0) {
+            if (errno == EINTR) continue;
+            return false;
+        }
+        
+        // Skip fully written frames and advance into a partially written one
+        size_t remaining = static_cast<size_t>(sent);
+        while (first < count && remaining >= iov[first].iov_len) {
+            remaining -= iov[first].iov_len;
+            ++first;
+        }
+        if (first < count) {
+            iov[first].iov_base = static_cast<uint8_t*>(iov[first].iov_base) + remaining;
+            iov[first].iov_len -= remaining;
+        }
+    }
+    return true;
+}
+
 void RelayTransport::heartbeatLoop() {
+    // Wait until the next deadline instead of sleeping, so disconnect wakes us at once
+    auto nextBeat = std::chrono::steady_clock::now() + std::chrono::seconds(HEARTBEAT_INTERVAL_SEC);
+    
     while (running_ && serverConnected_) {
-        std::this_thread::sleep_for(std::chrono::seconds(HEARTBEAT_INTERVAL_SEC));
+        {
+            std::unique_lock<std::mutex> lock(heartbeatMutex_);
+            heartbeatCv_.wait_until(lock, nextBeat, [this] {
+                return !running_ || !serverConnected_;
+            });
+        }
         
         if (running_ && serverConnected_) {
             sendMessage(RelayMessageType::HEARTBEAT, {});
+            nextBeat += std::chrono::seconds(HEARTBEAT_INTERVAL_SEC);
         }
     }
 }
@@ -331,24 +530,43 @@ void RelayTransport::heartbeatLoop() {
 bool RelayTransport::sendMessage(RelayMessageType type, const std::vector<uint8_t>& payload) {
     if (serverSocket_ < 0) return false;
     
-    // Format: [type (1 byte)][length (4 bytes)][payload]
-    std::vector<uint8_t> message;
-    message.push_back(static_cast<uint8_t>(type));
-    
-    uint32_t len = payload.size();
-    message.push_back((len >> 24) & 0xFF);
-    message.push_back((len >> 16) & 0xFF);
-    message.push_back((len >> 8) & 0xFF);
-    message.push_back(len & 0xFF);
+    std::vector<uint8_t> frame = acquireBuffer();
+    frame.reserve(RELAY_HEADER_SIZE + payload.size());
+    appendFrameHeader(frame, type, payload.size());
+    frame.insert(frame.end(), payload.begin(), payload.end());
     
-    message.insert(message.end(), payload.begin(), payload.end());
+    return enqueueFrame(std::move(frame));
+}
+
+bool RelayTransport::enqueueFrame(std::vector<uint8_t>&& frame) {
+    if (frame.size() - RELAY_HEADER_SIZE > MAX_FRAME_PAYLOAD) {
+        Logger::instance().log(LogLevel::ERROR, "Message too large for relay: " + std::to_string(frame.size()) + " bytes", "RelayTransport");
+        return false;
+    }
     
-    std::lock_guard<std::mutex> lock(writeMutex_);
-    writeQueue_.push(std::move(message));
+    {
+        std::lock_guard<std::mutex> lock(writeMutex_);
+        // Only DATA frames are bounded: control frames (REGISTER, CONNECT,
+        // HEARTBEAT, DISCONNECT, ...) are small and must not be starved by a
+        // backlog of payloads. A single DATA frame is always accepted into an
+        // empty queue so large payloads can still make progress.
+        bool isData = frame[0] == static_cast<uint8_t>(RelayMessageType::DATA);
+        bool full = isData &&
+                    (writeQueue_.size() >= MAX_WRITE_QUEUE ||
+                     (!writeQueue_.empty() && writeQueueBytes_ + frame.size() > MAX_WRITE_QUEUE_BYTES));
+        if (full) {
+            // Drop rather than let a slow relay link grow memory without bound
+            Logger::instance().log(LogLevel::WARN, "Relay write queue full, dropping message", "RelayTransport");
+            return false;
+        }
+        writeQueueBytes_ += frame.size();
+        writeQueue_.push(std::move(frame));
+    }
+    writeCv_.notify_one();
     return true;
 }
 
-void RelayTransport::handleMessage(RelayMessageType type, const std::vector<uint8_t>& payload) {
+void RelayTransport::handleMessage(RelayMessageType type, const uint8_t* payload, size_t length) {
     auto& logger = Logger::instance();
     
     switch (type) {
@@ -357,11 +575,11 @@ void RelayTransport::handleMessage(RelayMessageType type, const std::vector<uint
             break;
             
         case RelayMessageType::PEER_LIST:
-            handlePeerList(payload);
+            handlePeerList(payload, length);
             break;
             
         case RelayMessageType::CONNECT_ACK: {
-            std::string peerId(payload.begin(), payload.end());
+            std::string peerId(reinterpret_cast<const char*>(payload), length);
             {
                 std::lock_guard<std::mutex> lock(peerMutex_);
                 peerStates_[peerId] = ConnectionState::CONNECTED;
@@ -372,11 +590,11 @@ void RelayTransport::handleMessage(RelayMessageType type, const std::vector<uint
         }
             
         case RelayMessageType::DATA:
-            handleData(payload);
+            handleData(payload, length);
             break;
             
         case RelayMessageType::DISCONNECT: {
-            std::string peerId(payload.begin(), payload.end());
+            std::string peerId(reinterpret_cast<const char*>(payload), length);
             {
                 std::lock_guard<std::mutex> lock(peerMutex_);
                 peerStates_.erase(peerId);
@@ -391,7 +609,7 @@ void RelayTransport::handleMessage(RelayMessageType type, const std::vector<uint
             break;
             
         case RelayMessageType::ERROR_MSG: {
-            std::string error(payload.begin(), payload.end());
+            std::string error(reinterpret_cast<const char*>(payload), length);
             logger.log(LogLevel::ERROR, "Relay error: " + error, "RelayTransport");
             break;
         }
@@ -402,16 +620,34 @@ void RelayTransport::handleMessage(RelayMessageType type, const std::vector<uint
     }
 }
 
-void RelayTransport::handlePeerList(const std::vector<uint8_t>& payload) {
+void RelayTransport::handlePeerList(const uint8_t* payload, size_t length) {
     auto& logger = Logger::instance();
     
+    // Common case for a new session: nobody else registered yet
+    if (length == 0) {
+        {
+            std::lock_guard<std::mutex> lock(peerMutex_);
+            relayPeers_.clear();
+        }
+        logger.log(LogLevel::INFO, "Received 0 peers from relay", "RelayTransport");
+        return;
+    }
+    
     // Parse peer list: peer1|ip1|port1|natType1\npeer2|ip2|port2|natType2\n...
-    std::string data(payload.begin(), payload.end());
+    std::string data(reinterpret_cast<const char*>(payload), length);
     std::istringstream stream(data);
     std::string line;
     
-    std::lock_guard<std::mutex> lock(peerMutex_);
-    relayPeers_.clear();
+    // Every peer in one list shares the same receive time; format it once
+    auto time = std::chrono::system_clock::to_time_t(std::chrono::system_clock::now());
+    std::tm tmBuf{};
+    gmtime_r(&time, &tmBuf);
+    std::ostringstream oss;
+    oss << std::put_time(&tmBuf, "%Y-%m-%dT%H:%M:%SZ");
+    const std::string receivedAt = oss.str();
+    
+    // Parse into a local map first so peerMutex_ is only held for the swap
+    std::map<std::string, RelayPeerInfo> peers;
     
     while (std::getline(stream, line)) {
         if (line.empty()) continue;
@@ -432,33 +668,35 @@ void RelayTransport::handlePeerList(const std::vector<uint8_t>& payload) {
             peer.publicPort = std::stoi(portStr);
             peer.natType = natType;
             peer.online = true;
+            peer.connectedAt = receivedAt;
             
-            // Get current time as ISO string
-            auto now = std::chrono::system_clock::now();
-            auto time = std::chrono::system_clock::to_time_t(now);
-            std::ostringstream oss;
-            oss << std::put_time(std::gmtime(&time), "%Y-%m-%dT%H:%M:%SZ");
-            peer.connectedAt = oss.str();
+            logger.log(LogLevel::DEBUG, "Relay peer: " + peerId + " at " + ip, "RelayTransport");
             
-            relayPeers_[peerId] = peer;
+            peers[peerId] = std::move(peer);
+        }
+    }
+    
+    size_t peerCount = peers.size();
+    {
+        std::lock_guard<std::mutex> lock(peerMutex_);
+        relayPeers_.swap(peers);
+        for (const auto& [peerId, _] : relayPeers_) {
             peerStates_[peerId] = ConnectionState::CONNECTED;
-            
-            logger.log(LogLevel::DEBUG, "Relay peer: " + peerId + " at " + ip, "RelayTransport");
         }
     }
     
-    logger.log(LogLevel::INFO, "Received " + std::to_string(relayPeers_.size()) + " peers from relay", "RelayTransport");
+    logger.log(LogLevel::INFO, "Received " + std::to_string(peerCount) + " peers from relay", "RelayTransport");
 }
 
-void RelayTransport::handleData(const std::vector<uint8_t>& payload) {
-    if (payload.size() < 2) return;
+void RelayTransport::handleData(const uint8_t* payload, size_t length) {
+    if (length < 2) return;
     
     // Format: [peerId length (1 byte)][peerId][data]
     uint8_t peerIdLen = payload[0];
-    if (payload.size() < 1 + peerIdLen) return;
+    if (length < 1 + static_cast<size_t>(peerIdLen)) return;
     
-    std::string fromPeerId(payload.begin() + 1, payload.begin() + 1 + peerIdLen);
-    std::vector<uint8_t> data(payload.begin() + 1 + peerIdLen, payload.end());
+    std::string fromPeerId(reinterpret_cast<const char*>(payload + 1), peerIdLen);
+    std::vector<uint8_t> data(payload + 1 + peerIdLen, payload + length);
     
     MetricsCollector::instance().incrementBytesReceived(data.size());
     
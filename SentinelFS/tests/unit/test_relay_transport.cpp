@@ -0,0 +1,374 @@
+#include "RelayTransport.h"
+#include "SessionManager.h"
+#include "Logger.h"
+#include <iostream>
+#include <cassert>
+#include <atomic>
+#include <chrono>
+#include <cstring>
+#include <filesystem>
+#include <fstream>
+#include <functional>
+#include <mutex>
+#include <string>
+#include <thread>
+#include <vector>
+#include <sys/socket.h>
+#include <netinet/in.h>
+#include <arpa/inet.h>
+#include <unistd.h>
+
+using namespace SentinelFS;
+using namespace SentinelFS::NetFalcon;
+
+namespace {
+
+/**
+ * @brief Minimal loopback relay server speaking the relay framing
+ */
+class FakeRelay {
+public:
+    FakeRelay() {
+        listenFd_ = socket(AF_INET, SOCK_STREAM, 0);
+        int opt = 1;
+        setsockopt(listenFd_, SOL_SOCKET, SO_REUSEADDR, &opt, sizeof(opt));
+
+        sockaddr_in addr{};
+        addr.sin_family = AF_INET;
+        addr.sin_addr.s_addr = htonl(INADDR_LOOPBACK);
+        addr.sin_port = 0;
+        assert(bind(listenFd_, reinterpret_cast<sockaddr*>(&addr), sizeof(addr)) == 0);
+        assert(listen(listenFd_, 1) == 0);
+
+        socklen_t len = sizeof(addr);
+        getsockname(listenFd_, reinterpret_cast<sockaddr*>(&addr), &len);
+        port_ = ntohs(addr.sin_port);
+    }
+
+    ~FakeRelay() {
+        if (clientFd_ >= 0) close(clientFd_);
+        if (listenFd_ >= 0) close(listenFd_);
+    }
+
+    int port() const { return port_; }
+
+    void setReceiveBuffer(int bytes) {
+        // Inherited by the accepted socket
+        setsockopt(listenFd_, SOL_SOCKET, SO_RCVBUF, &bytes, sizeof(bytes));
+    }
+
+    void accept() {
+        clientFd_ = ::accept(listenFd_, nullptr, nullptr);
+        assert(clientFd_ >= 0);
+    }
+
+    bool readFrame(uint8_t& type, std::vector<uint8_t>& payload) {
+        uint8_t header[RELAY_HEADER_SIZE];
+        if (!readExact(header, sizeof(header))) return false;
+        type = header[0];
+        uint32_t length = (static_cast<uint32_t>(header[1]) << 24) |
+                          (static_cast<uint32_t>(header[2]) << 16) |
+                          (static_cast<uint32_t>(header[3]) << 8) |
+                          static_cast<uint32_t>(header[4]);
+        payload.resize(length);
+        return length == 0 || readExact(payload.data(), length);
+    }
+
+    // Write in fixed-size pieces to force frames to straddle recv() calls
+    void writeRaw(const std::vector<uint8_t>& bytes, size_t pieceSize = 0) {
+        size_t step = pieceSize ? pieceSize : bytes.size();
+        for (size_t off = 0; off < bytes.size(); off += step) {
+            size_t n = std::min(step, bytes.size() - off);
+            assert(::send(clientFd_, bytes.data() + off, n, MSG_NOSIGNAL) == static_cast<ssize_t>(n));
+            if (pieceSize) std::this_thread::sleep_for(std::chrono::microseconds(200));
+        }
+    }
+
+    static void appendFrame(std::vector<uint8_t>& out, RelayMessageType type,
+                            const std::vector<uint8_t>& payload) {
+        uint32_t len = static_cast<uint32_t>(payload.size());
+        out.push_back(static_cast<uint8_t>(type));
+        out.push_back(static_cast<uint8_t>(len >> 24));
+        out.push_back(static_cast<uint8_t>(len >> 16));
+        out.push_back(static_cast<uint8_t>(len >> 8));
+        out.push_back(static_cast<uint8_t>(len));
+        out.insert(out.end(), payload.begin(), payload.end());
+    }
+
+    static std::vector<uint8_t> dataPayload(const std::string& fromPeer, const std::vector<uint8_t>& data) {
+        std::vector<uint8_t> payload;
+        payload.push_back(static_cast<uint8_t>(fromPeer.size()));
+        payload.insert(payload.end(), fromPeer.begin(), fromPeer.end());
+        payload.insert(payload.end(), data.begin(), data.end());
+        return payload;
+    }
+
+    // Accept and consume the REGISTER + PEER_LIST request sent on connect
+    void acceptAndHandshake() {
+        accept();
+        uint8_t type;
+        std::vector<uint8_t> payload;
+        assert(readFrame(type, payload));
+        assert(type == static_cast<uint8_t>(RelayMessageType::REGISTER));
+        assert(readFrame(type, payload));
+        assert(type == static_cast<uint8_t>(RelayMessageType::PEER_LIST));
+    }
+
+private:
+    bool readExact(uint8_t* out, size_t length) {
+        size_t got = 0;
+        while (got < length) {
+            ssize_t n = recv(clientFd_, out + got, length - got, 0);
+            if (n <= 0) return false;
+            got += static_cast<size_t>(n);
+        }
+        return true;
+    }
+
+    int listenFd_{-1};
+    int clientFd_{-1};
+    int port_{0};
+};
+
+struct Received {
+    std::mutex mutex;
+    std::vector<std::vector<uint8_t>> data;
+
+    size_t count() {
+        std::lock_guard<std::mutex> lock(mutex);
+        return data.size();
+    }
+};
+
+bool waitFor(const std::function<bool()>& condition, int timeoutMs = 5000) {
+    auto deadline = std::chrono::steady_clock::now() + std::chrono::milliseconds(timeoutMs);
+    while (std::chrono::steady_clock::now() < deadline) {
+        if (condition()) return true;
+        std::this_thread::sleep_for(std::chrono::milliseconds(5));
+    }
+    return condition();
+}
+
+std::vector<uint8_t> pattern(size_t size, uint8_t seed) {
+    std::vector<uint8_t> data(size);
+    for (size_t i = 0; i < size; ++i) {
+        data[i] = static_cast<uint8_t>(seed + i * 31);
+    }
+    return data;
+}
+
+void collectData(RelayTransport& transport, Received& received) {
+    transport.setEventCallback([&received](const TransportEventData& event) {
+        if (event.event == TransportEvent::DATA_RECEIVED) {
+            std::lock_guard<std::mutex> lock(received.mutex);
+            received.data.push_back(event.data);
+        }
+    });
+}
+
+} // namespace
+
+void test_frames_split_across_reads() {
+    std::cout << "Running test_frames_split_across_reads..." << std::endl;
+
+    SessionManager sessionManager;
+    RelayTransport transport(nullptr, &sessionManager);
+    Received received;
+    collectData(transport, received);
+
+    FakeRelay relay;
+    std::thread server([&relay] {
+        relay.acceptAndHandshake();
+
+        std::vector<uint8_t> stream;
+        FakeRelay::appendFrame(stream, RelayMessageType::REGISTER_ACK, {});
+        std::string peers = "peerB|10.0.0.2|9000|full\n";
+        FakeRelay::appendFrame(stream, RelayMessageType::PEER_LIST,
+                               std::vector<uint8_t>(peers.begin(), peers.end()));
+        for (int i = 0; i < 20; ++i) {
+            FakeRelay::appendFrame(stream, RelayMessageType::DATA,
+                                   FakeRelay::dataPayload("peerB", pattern(100 + i, static_cast<uint8_t>(i))));
+        }
+        // 3-byte pieces split every header and payload
+        relay.writeRaw(stream, 3);
+    });
+
+    assert(transport.connectToServer("127.0.0.1", relay.port(), "SESS01"));
+    server.join();
+
+    assert(waitFor([&] { return received.count() == 20; }));
+    for (int i = 0; i < 20; ++i) {
+        assert(received.data[i] == pattern(100 + i, static_cast<uint8_t>(i)));
+    }
+
+    auto peers = transport.getRelayPeers();
+    assert(peers.size() == 1);
+    assert(peers[0].peerId == "peerB");
+    assert(peers[0].publicPort == 9000);
+
+    transport.disconnectFromServer();
+    std::cout << "test_frames_split_across_reads passed." << std::endl;
+}
+
+void test_many_frames_in_one_read_and_large_frame() {
+    std::cout << "Running test_many_frames_in_one_read_and_large_frame..." << std::endl;
+
+    SessionManager sessionManager;
+    RelayTransport transport(nullptr, &sessionManager);
+    Received received;
+    collectData(transport, received);
+
+    const size_t largeSize = 3 * 1024 * 1024;
+    FakeRelay relay;
+    std::thread server([&relay, largeSize] {
+        relay.acceptAndHandshake();
+
+        std::vector<uint8_t> stream;
+        for (int i = 0; i < 10; ++i) {
+            FakeRelay::appendFrame(stream, RelayMessageType::DATA,
+                                   FakeRelay::dataPayload("peerB", pattern(16, static_cast<uint8_t>(i))));
+        }
+        FakeRelay::appendFrame(stream, RelayMessageType::DATA,
+                               FakeRelay::dataPayload("peerB", pattern(largeSize, 7)));
+        FakeRelay::appendFrame(stream, RelayMessageType::DATA,
+                               FakeRelay::dataPayload("peerB", pattern(16, 99)));
+        relay.writeRaw(stream);
+    });
+
+    assert(transport.connectToServer("127.0.0.1", relay.port(), "SESS01"));
+    server.join();
+
+    assert(waitFor([&] { return received.count() == 12; }));
+    for (int i = 0; i < 10; ++i) {
+        assert(received.data[i] == pattern(16, static_cast<uint8_t>(i)));
+    }
+    assert(received.data[10] == pattern(largeSize, 7));
+    assert(received.data[11] == pattern(16, 99));
+
+    transport.disconnectFromServer();
+    std::cout << "test_many_frames_in_one_read_and_large_frame passed." << std::endl;
+}
+
+void test_send_batches_larger_than_socket_buffer() {
+    std::cout << "Running test_send_batches_larger_than_socket_buffer..." << std::endl;
+
+    SessionManager sessionManager;
+    RelayTransport transport(nullptr, &sessionManager);
+
+    const int frameCount = 64;
+    const size_t frameSize = 128 * 1024;
+    FakeRelay relay;
+    relay.setReceiveBuffer(16 * 1024);
+
+    std::atomic<int> verified{0};
+    std::thread server([&] {
+        relay.acceptAndHandshake();
+        // Let the client's send buffer fill so sendmsg() writes partially
+        std::this_thread::sleep_for(std::chrono::milliseconds(300));
+
+        for (int i = 0; i < frameCount; ++i) {
+            uint8_t type;
+            std::vector<uint8_t> payload;
+            assert(relay.readFrame(type, payload));
+            assert(type == static_cast<uint8_t>(RelayMessageType::DATA));
+            assert(payload[0] == 5);
+            assert(std::string(payload.begin() + 1, payload.begin() + 6) == "peerB");
+            std::vector<uint8_t> data(payload.begin() + 6, payload.end());
+            assert(data == pattern(frameSize, static_cast<uint8_t>(i)));
+            ++verified;
+        }
+    });
+
+    assert(transport.connectToServer("127.0.0.1", relay.port(), "SESS01"));
+    for (int i = 0; i < frameCount; ++i) {
+        assert(transport.send("peerB", pattern(frameSize, static_cast<uint8_t>(i))));
+    }
+
+    server.join();
+    assert(verified == frameCount);
+
+    transport.disconnectFromServer();
+    std::cout << "test_send_batches_larger_than_socket_buffer passed." << std::endl;
+}
+
+void test_disconnect_during_blocked_send() {
+    std::cout << "Running test_disconnect_during_blocked_send..." << std::endl;
+
+    auto logPath = std::filesystem::temp_directory_path() / "test_relay_transport.log";
+    std::filesystem::remove(logPath);
+    Logger::instance().setLogFile(logPath.string());
+
+    SessionManager sessionManager;
+    RelayTransport transport(nullptr, &sessionManager);
+
+    FakeRelay relay;
+    relay.setReceiveBuffer(16 * 1024);
+    std::thread server([&relay] { relay.acceptAndHandshake(); }); // Then never reads again
+
+    assert(transport.connectToServer("127.0.0.1", relay.port(), "SESS01"));
+    server.join();
+
+    assert(transport.send("peerB", pattern(8 * 1024 * 1024, 1)));
+    std::this_thread::sleep_for(std::chrono::milliseconds(200)); // Writer is now blocked in sendmsg()
+
+    auto start = std::chrono::steady_clock::now();
+    transport.disconnectFromServer();
+    auto elapsed = std::chrono::duration_cast<std::chrono::milliseconds>(
+        std::chrono::steady_clock::now() - start).count();
+
+    // Shutdown unblocks the writer instead of waiting out SO_SNDTIMEO
+    assert(elapsed < 2000);
+    assert(!transport.isServerConnected());
+
+    Logger::instance().setLogFile(""); // Close the file before reading it
+    std::ifstream log(logPath);
+    std::string contents((std::istreambuf_iterator<char>(log)), std::istreambuf_iterator<char>());
+    // A requested disconnect is not a send failure
+    assert(contents.find("Failed to send to relay") == std::string::npos);
+    std::filesystem::remove(logPath);
+
+    std::cout << "test_disconnect_during_blocked_send passed." << std::endl;
+}
+
+void test_oversized_frame_drops_connection_and_reconnects() {
+    std::cout << "Running test_oversized_frame_drops_connection_and_reconnects..." << std::endl;
+
+    SessionManager sessionManager;
+    RelayTransport transport(nullptr, &sessionManager);
+
+    FakeRelay relay;
+    std::thread server([&relay] {
+        relay.acceptAndHandshake();
+        // Header announcing a 20 MB payload, above MAX_FRAME_PAYLOAD
+        relay.writeRaw({static_cast<uint8_t>(RelayMessageType::DATA), 0x01, 0x40, 0x00, 0x00});
+    });
+
+    assert(transport.connectToServer("127.0.0.1", relay.port(), "SESS01"));
+    server.join();
+    assert(waitFor([&] { return !transport.isServerConnected(); }));
+
+    // The dropped connection's threads must be torn down, not overwritten
+    FakeRelay second;
+    std::thread secondServer([&second] { second.acceptAndHandshake(); });
+    assert(transport.connectToServer("127.0.0.1", second.port(), "SESS01"));
+    secondServer.join();
+    assert(transport.isServerConnected());
+
+    transport.disconnectFromServer();
+    std::cout << "test_oversized_frame_drops_connection_and_reconnects passed." << std::endl;
+}
+
+int main() {
+    try {
+        test_frames_split_across_reads();
+        test_many_frames_in_one_read_and_large_frame();
+        test_send_batches_larger_than_socket_buffer();
+        test_disconnect_during_blocked_send();
+        test_oversized_frame_drops_connection_and_reconnects();
+        std::cout << "All RelayTransport tests passed!" << std::endl;
+        return 0;
+    } catch (const std::exception& e) {
+        std::cerr << "Test failed with exception: " << e.what() << std::endl;
+        return 1;
+    }
+}